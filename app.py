@@ -3,18 +3,29 @@
 from __future__ import annotations
 
 import logging
-from datetime import datetime
-from typing import Any, Mapping
+import sys
+import time
+from typing import Any, Final, Iterator
 
-from flask import Flask, abort, jsonify, request
+import orjson
+from flask import Flask, Response, abort, request, stream_with_context
+from flask.json.provider import JSONProvider
 from flask_cors import CORS
-from sqlalchemy.exc import SQLAlchemyError
-from werkzeug.exceptions import HTTPException
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from werkzeug.datastructures import MultiDict
+from werkzeug.exceptions import HTTPException, InternalServerError
 from pydantic import ValidationError as PydanticValidationError
 
 from database import db, init_db
-from models import Order
-from schemas import OrderCreateSchema, OrderFiltersSchema
+from models import Order, OrderCounter
+from schemas import (
+    EMAIL_PATTERN,
+    PHONE_LENGTH,
+    PHONE_PATTERN,
+    PRIORITY_CHOICES,
+    get_order_filters_adapter,
+)
 
 logging.basicConfig(
     level=logging.INFO,
@@ -22,19 +33,72 @@ logging.basicConfig(
 )
 logger = logging.getLogger("toro.api")
 
+# Naive datetimes are stored in UTC; emit them as ISO 8601 with a "Z" suffix
+# and second precision, e.g. "2025-01-31T08:15:00Z".
+_ORJSON_OPTIONS = (
+    orjson.OPT_NAIVE_UTC
+    | orjson.OPT_UTC_Z
+    | orjson.OPT_OMIT_MICROSECONDS
+    | orjson.OPT_NON_STR_KEYS
+)
+
+
+class OrjsonProvider(JSONProvider):
+    """JSON provider that delegates (de)serialization to orjson.
+
+    Flask's default provider goes through the pure-Python stdlib encoder,
+    which dominates response time for large order lists.
+    """
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return orjson.dumps(obj, option=_ORJSON_OPTIONS).decode()
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+
+
 # Keep the app/module level singleton so `flask run` and WSGI servers reuse
 # the same initialized extensions.
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 app.config["JSON_SORT_KEYS"] = False
 CORS(app)  # Allow all origins for easier integration during development.
 init_db(app)  # Creates tables on first import to guarantee the API is usable.
 
 
+# Number of rows fetched and serialized per chunk of the streamed order list.
+LIST_BATCH_SIZE = 500
+
+_PRIORITY_ERROR = f"Priority must be one of {sorted(PRIORITY_CHOICES)}"
+# Client-supplied string fields mapped to their maximum length. Phone and
+# email get additional format checks in `validate_order_payload`.
+_STRING_FIELD_LIMITS: dict[str, int] = {
+    "equipment_type": 120,
+    "equipment_id": 120,
+    "issue_description": 2000,
+    "requester_name": 120,
+    "department": 120,
+    "contact_phone": PHONE_LENGTH,
+    "contact_email": 255,
+}
+# Human-readable field names for error messages, built once at import.
+_FIELD_LABELS: dict[str, str] = {
+    field: field.replace("_", " ").capitalize() for field in _STRING_FIELD_LIMITS
+}
+REQUIRED_FIELDS = frozenset(_STRING_FIELD_LIMITS)
+ALLOWED_FIELDS = REQUIRED_FIELDS | {"priority"}
+
+
+# Canonical greeting for simple diagnostics. Hot paths such as health checks
+# should reference the constant rather than calling `hello_world()`.
+HELLO_WORLD: Final[str] = sys.intern("Hello, World!")
+
+
 def hello_world() -> str:
     """Return the canonical greeting for simple diagnostics."""
 
-    # Keep this helper centralized so tests or routes can reuse it.
-    return "Hello, World!"
+    # Kept for existing callers; returns the shared interned constant.
+    return HELLO_WORLD
 
 
 class RequestValidationError(ValueError):
@@ -48,123 +112,273 @@ class RequestValidationError(ValueError):
 def _format_pydantic_errors(error: PydanticValidationError) -> dict[str, str]:
     """Flatten pydantic errors into a field -> message mapping."""
 
-    formatted: dict[str, str] = {}
-    for err in error.errors():
-        location = ".".join(str(part) for part in err.get("loc", ()))
-        formatted[location or "body"] = err.get("msg", "Invalid value")
-    return formatted
+    # Only `loc` and `msg` are reported, so skip building URLs, inputs and
+    # context for each error.
+    return {
+        (".".join(map(str, err["loc"])) or "body"): err["msg"]
+        for err in error.errors(
+            include_url=False, include_input=False, include_context=False
+        )
+    }
 
 
-def validate_order_payload(payload: Any) -> dict[str, Any]:
-    """Run pydantic validation for incoming order creation requests."""
+def read_json() -> Any:
+    """Decode the JSON request body with orjson.
 
-    if not isinstance(payload, dict):
-        raise RequestValidationError({"body": "JSON body must be an object"})
+    Returns ``None`` when the request carries no JSON body so callers can
+    report it as missing; undecodable bodies are rejected as invalid.
+    """
 
+    if not request.is_json:
+        return None
+    data = request.get_data(cache=False)
+    if not data:
+        return None
     try:
-        validated = OrderCreateSchema.model_validate(payload)
-    except PydanticValidationError as exc:
-        raise RequestValidationError(_format_pydantic_errors(exc)) from exc
+        return orjson.loads(data)
+    except orjson.JSONDecodeError as exc:
+        raise RequestValidationError({"body": "Malformed JSON"}) from exc
 
-    return validated.model_dump()
 
+def validate_order_payload(payload: Any) -> dict[str, Any]:
+    """Validate and normalize an incoming order creation payload.
+
+    Hand-rolled on purpose: this runs on every POST and a handful of set
+    operations and string checks is several times cheaper than building a
+    pydantic model for a flat, fixed set of fields.
+    """
 
-def validate_filters(args: Mapping[str, str]) -> dict[str, str]:
+    if not isinstance(payload, dict):
+        raise RequestValidationError({"body": "JSON body must be an object"})
+
+    errors: dict[str, str] = {}
+    for field in payload.keys() - ALLOWED_FIELDS:
+        errors[field] = "Extra inputs are not permitted"
+    for field in REQUIRED_FIELDS - payload.keys():
+        errors[field] = "Field required"
+
+    data: dict[str, Any] = {}
+    for field, max_length in _STRING_FIELD_LIMITS.items():
+        if field not in payload:
+            continue
+        value = payload[field]
+        if not isinstance(value, str):
+            errors[field] = "Input should be a valid string"
+            continue
+        value = value.strip()
+        if not value:
+            errors[field] = f"{_FIELD_LABELS[field]} must not be empty"
+        elif len(value) > max_length:
+            errors[field] = (
+                f"{_FIELD_LABELS[field]} must not exceed {max_length} characters"
+            )
+        else:
+            data[field] = value
+
+    phone = data.get("contact_phone")
+    # The format has a fixed width, so reject other lengths before the regex.
+    if phone is not None and (
+        len(phone) != PHONE_LENGTH or not PHONE_PATTERN.match(phone)
+    ):
+        errors["contact_phone"] = "Phone must match +7-XXX-XXX-XX-XX"
+
+    email = data.get("contact_email")
+    if email is not None and not EMAIL_PATTERN.match(email):
+        errors["contact_email"] = "Email must look like name@example.com"
+
+    priority = payload.get("priority", "medium")
+    if isinstance(priority, str) and priority in PRIORITY_CHOICES:
+        data["priority"] = priority
+    else:
+        errors["priority"] = _PRIORITY_ERROR
+
+    if errors:
+        raise RequestValidationError(errors)
+
+    return data
+
+
+def validate_filters(args: MultiDict[str, str]) -> dict[str, str]:
     """Validate query parameters for list endpoint via pydantic."""
 
     try:
-        filters = OrderFiltersSchema.model_validate(dict(args))
+        filters = get_order_filters_adapter().validate_python(
+            args.to_dict(flat=True)
+        )
     except PydanticValidationError as exc:
         raise RequestValidationError(_format_pydantic_errors(exc)) from exc
 
     return filters.model_dump(exclude_none=True)
 
 
-def generate_order_number() -> str:
-    """Generate the next order number in the TORO-YYYY-NNN format."""
+def make_json_response(data: Any, status: int = 200) -> Response:
+    """Serialize ``data`` with orjson straight into a JSON response.
 
-    current_year = datetime.utcnow().year
-    prefix = f"TORO-{current_year}-"
+    Unlike ``jsonify`` this hands the encoded bytes to Flask as-is, skipping
+    the provider round trip and the str -> bytes re-encoding step.
+    """
 
+    body = orjson.dumps(data, option=_ORJSON_OPTIONS)
+    return Response(body, status=status, mimetype="application/json")
+
+
+# Order number prefixes keyed by year; formatted at most once per year.
+_ORDER_PREFIXES: dict[int, str] = {}
+
+
+def _last_issued_sequence(prefix: str) -> int:
+    """Return the highest sequence already used by orders with ``prefix``."""
+
+    # Sequences are not zero-padded past three digits, so a longer suffix is
+    # always the larger one; plain string order would rank 999 above 1005.
     latest_order = (
         Order.query.filter(Order.order_number.like(f"{prefix}%"))
-        .order_by(Order.order_number.desc())
+        .order_by(func.length(Order.order_number).desc(), Order.order_number.desc())
         .first()
     )
+    if latest_order is None:
+        return 0
+    try:
+        return int(latest_order.order_number.split("-")[-1])
+    except (AttributeError, ValueError):
+        # Fallback to the DB id to avoid collisions if someone tampered
+        # with the order number manually.
+        return latest_order.id
 
-    # Default to 001 when there are no orders for the current year yet.
-    next_sequence = 1
-    if latest_order:
-        try:
-            next_sequence = int(latest_order.order_number.split("-")[-1]) + 1
-        except (AttributeError, ValueError):
-            # Fallback to the DB id to avoid collisions if someone tampered
-            # with the order number manually.
-            next_sequence = latest_order.id + 1
 
-    return f"{prefix}{next_sequence:03d}"
+def _order_prefix(year: int) -> str:
+    """Return the cached ``TORO-YYYY-`` prefix for ``year``."""
 
+    return _ORDER_PREFIXES.get(year) or _ORDER_PREFIXES.setdefault(
+        year, f"TORO-{year}-"
+    )
 
-@app.route("/api/v1/orders", methods=["POST"])
+
+def _resync_order_counter() -> None:
+    """Catch the current year's counter up with existing order numbers.
+
+    Needed when numbers ahead of the counter were written outside
+    `generate_order_number` (manual fix-ups, restores, imports).
+    """
+
+    current_year = time.gmtime().tm_year
+    OrderCounter.raise_to(
+        current_year, _last_issued_sequence(_order_prefix(current_year))
+    )
+
+
+def generate_order_number() -> str:
+    """Allocate the next order number in the TORO-YYYY-NNN format.
+
+    Sequences live in ``order_counters`` and are bumped in the caller's
+    transaction, so a rolled back order releases its number and concurrent
+    writers never observe the same value.
+    """
+
+    current_year = time.gmtime().tm_year
+    prefix = _order_prefix(current_year)
+
+    sequence = OrderCounter.next_seq(
+        current_year, lambda: _last_issued_sequence(prefix)
+    )
+
+    return f"{prefix}{sequence:03d}"
+
+
+def _insert_order(data: dict[str, Any]) -> dict[str, Any]:
+    """Insert a new order with a freshly allocated number and return its row."""
+
+    orders_table = Order.__table__
+    # `status` and `order_number` are controlled server-side to prevent
+    # clients from spoofing state transitions. Insert through Core and read
+    # the stored row back via RETURNING: the response needs no ORM instance,
+    # so skip its construction and unit-of-work bookkeeping.
+    stmt = (
+        orders_table.insert()
+        .values(order_number=generate_order_number(), status="created", **data)
+        .returning(orders_table)
+    )
+    return dict(db.session.execute(stmt).mappings().one())
+
+
+@app.post("/api/v1/orders")
 def create_order() -> Any:
     """Create a new order."""
 
-    payload = request.get_json(silent=True)
+    payload = read_json()
     if payload is None:
         raise RequestValidationError({"body": "JSON body is required"})
 
     data = validate_order_payload(payload)
 
-    # `status` and `order_number` are controlled server-side to prevent
-    # clients from spoofing state transitions.
-    order = Order(
-        order_number=generate_order_number(),
-        status="created",
-        **data,
-    )
-
     try:
-        db.session.add(order)
+        try:
+            order = _insert_order(data)
+        except IntegrityError:
+            # The allocated number is already taken, i.e. the counter fell
+            # behind numbers written elsewhere. Catch it up and retry once.
+            db.session.rollback()
+            _resync_order_counter()
+            order = _insert_order(data)
         db.session.commit()
-    except SQLAlchemyError as exc:  # pragma: no cover - DB failure path
+    except SQLAlchemyError as exc:
         db.session.rollback()
         logger.exception("Failed to create order: %s", exc)
         abort(500, description="Unable to create order at this time")
 
     logger.info(
         "Created order %s (%s) for equipment %s by %s",
-        order.order_number,
-        order.priority,
-        order.equipment_id,
-        order.requester_name,
+        order["order_number"],
+        order["priority"],
+        order["equipment_id"],
+        order["requester_name"],
     )
 
-    return jsonify(order.to_dict()), 201
+    return make_json_response(order, 201)
 
 
-@app.route("/api/v1/orders", methods=["GET"])
+@app.get("/api/v1/orders")
 def list_orders() -> Any:
     """Return a list of orders with optional filtering."""
 
-    filters = validate_filters(request.args)
-
-    query = Order.query
-    if "priority" in filters:
-        query = query.filter_by(priority=filters["priority"])
-    if "status" in filters:
-        query = query.filter_by(status=filters["status"])
-    if "department" in filters:
-        query = query.filter_by(department=filters["department"])
-
-    orders = query.order_by(Order.created_at.desc()).all()
-
-    return (
-        jsonify({"orders": [order.to_dict() for order in orders], "total": len(orders)}),
-        200,
+    # Plain "list everything" calls carry no query string; skip validation.
+    filters = validate_filters(request.args) if request.args else {}
+
+    # Columns-only read through Core: rows come back as plain mappings, so
+    # there is no ORM instance construction, attribute instrumentation or
+    # identity-map insert per row, which dominates large listings. Keep ORM
+    # entities out of this select. Filter keys are validated column names, so
+    # they map onto ``filter_by`` 1:1.
+    orders_table = Order.__table__
+    stmt = (
+        select(orders_table)
+        .filter_by(**filters)
+        .order_by(orders_table.c.created_at.desc())
+        .execution_options(yield_per=LIST_BATCH_SIZE)
     )
-
-
-@app.route("/api/v1/orders/<int:order_id>", methods=["GET"])
+    # Execute eagerly so database errors still produce a regular error
+    # response instead of a truncated stream.
+    rows = db.session.execute(stmt).mappings()
+
+    def generate() -> Iterator[bytes]:
+        # Serialize batch by batch so memory stays bounded by the batch size
+        # rather than the size of the whole result set. Rows are trusted DB
+        # output and go to orjson without a response-schema validation pass.
+        total = 0
+        separator = b""
+        yield b'{"orders":['
+        for batch in rows.partitions():
+            yield separator + b",".join(
+                orjson.dumps(dict(row), option=_ORJSON_OPTIONS) for row in batch
+            )
+            separator = b","
+            total += len(batch)
+        yield b'],"total":%d}' % total
+
+    return Response(stream_with_context(generate()), mimetype="application/json")
+
+
+@app.get("/api/v1/orders/<int:order_id>")
 def get_order(order_id: int) -> Any:
     """Return a single order by its identifier."""
 
@@ -172,13 +386,17 @@ def get_order(order_id: int) -> Any:
     if order is None:
         abort(404, description="Order not found")
 
-    return jsonify(order.to_dict()), 200
+    # Stored rows were validated on the way in; serialize them as-is rather
+    # than re-validating trusted DB output through a response schema.
+    return make_json_response(order.to_dict())
 
 
 @app.errorhandler(RequestValidationError)
 def handle_validation_error(error: RequestValidationError):
     logger.warning("Validation error: %s", error.errors)
-    return jsonify({"error": "validation_error", "details": error.errors}), 400
+    return make_json_response(
+        {"error": "validation_error", "details": error.errors}, 400
+    )
 
 
 @app.errorhandler(HTTPException)
@@ -187,16 +405,22 @@ def handle_http_exception(error: HTTPException):
         "error": error.name.replace(" ", "_").lower(),
         "message": error.description,
     }
-    return jsonify(response), error.code
+    return make_json_response(response, error.code)
 
 
-@app.errorhandler(Exception)
-def handle_exception(error: Exception):  # pragma: no cover - fallback path
-    logger.exception("Unhandled error: %s", error)
-    return (
-        jsonify({"error": "internal_server_error", "message": "Unexpected server error"}),
-        500,
-    )
+# Unhandled errors always produce the same body, so encode it only once.
+_INTERNAL_ERROR_BODY = orjson.dumps(
+    {"error": "internal_server_error", "message": "Unexpected server error"}
+)
+
+
+@app.errorhandler(InternalServerError)
+def handle_internal_error(error: InternalServerError):
+    # Explicit `abort(500, ...)` calls carry their own description; anything
+    # else is an unhandled exception that Flask has already logged.
+    if error.original_exception is None:
+        return handle_http_exception(error)
+    return Response(_INTERNAL_ERROR_BODY, status=500, mimetype="application/json")
 
 
 if __name__ == "__main__":
@@ -3,12 +3,56 @@
 from __future__ import annotations
 
 import os
+from typing import Any
+
 from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event, make_url
 
 # Global SQLAlchemy instance shared across modules.
 db = SQLAlchemy()
 
+# WAL lets readers proceed while a writer commits, and NORMAL sync skips the
+# per-commit fsync of the rollback journal while staying crash-safe in WAL.
+_SQLITE_PRAGMAS: tuple[str, ...] = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-65536",
+)
+
+
+def _apply_sqlite_pragmas(dbapi_connection: Any, _connection_record: Any) -> None:
+    """Tune every new SQLite connection for concurrent API traffic."""
+
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in _SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
+
+
+def _engine_options(database_url: str) -> dict[str, Any]:
+    """Return connection pool settings suited to the database backend."""
+
+    url = make_url(database_url)
+    if url.get_backend_name() != "sqlite":
+        # Size the pool for concurrent create/list traffic and verify idle
+        # connections before each use.
+        return {
+            "pool_size": 20,
+            "max_overflow": 40,
+            "pool_pre_ping": True,
+            "pool_recycle": 1800,
+        }
+
+    # Local files need no liveness checks; wait for a busy writer instead of
+    # failing immediately with "database is locked".
+    # In-memory databases get a StaticPool from Flask-SQLAlchemy itself.
+    return {"connect_args": {"check_same_thread": False, "timeout": 30}}
+
 
 def init_db(app: Flask) -> None:
     """Configure SQLAlchemy on the provided app and create tables.
@@ -21,12 +65,16 @@ def init_db(app: Flask) -> None:
     database_url = os.getenv("TORO_DATABASE_URL", "sqlite:///toro.db")
     app.config.setdefault("SQLALCHEMY_DATABASE_URI", database_url)
     app.config.setdefault("SQLALCHEMY_TRACK_MODIFICATIONS", False)
-    # Ensure idle connections are verified before each use.
-    app.config.setdefault("SQLALCHEMY_ENGINE_OPTIONS", {"pool_pre_ping": True})
+    app.config.setdefault(
+        "SQLALCHEMY_ENGINE_OPTIONS",
+        _engine_options(app.config["SQLALCHEMY_DATABASE_URI"]),
+    )
 
     db.init_app(app)
 
     with app.app_context():
+        if db.engine.dialect.name == "sqlite":
+            event.listen(db.engine, "connect", _apply_sqlite_pragmas)
         db.create_all()
 
 
@@ -2,10 +2,35 @@
 
 from __future__ import annotations
 
+import re
 from datetime import datetime
+from typing import Any, Callable, Iterable, Mapping
+
+from sqlalchemy import text
 
 from database import db
 
+# TORO-YYYY-NNN as issued by the API; NNN may grow past three digits.
+_ORDER_NUMBER_PATTERN = re.compile(r"^TORO-(\d{4})-(\d+)$", re.ASCII)
+
+# Columns serialized by `Order.to_dict`, in output order.
+_ORDER_DICT_KEYS: tuple[str, ...] = (
+    "id",
+    "order_number",
+    "equipment_type",
+    "equipment_id",
+    "issue_description",
+    "priority",
+    "status",
+    "requester_name",
+    "department",
+    "contact_phone",
+    "contact_email",
+    "created_at",
+    "updated_at",
+)
+_ORDER_DICT_KEY_SET = frozenset(_ORDER_DICT_KEYS)
+
 
 class Order(db.Model):
     """Represents a maintenance or repair order."""
@@ -28,34 +53,127 @@ class Order(db.Model):
         db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow
     )
 
+    # `list_orders` filters by any combination of these columns and always
+    # sorts by newest first, so each index serves both the lookup and the
+    # ordering. Department leads the composite index because it is more
+    # selective than status.
+    __table_args__ = (
+        db.Index("ix_orders_created_at", created_at),
+        db.Index("ix_orders_status_created_desc", status, created_at.desc()),
+        db.Index("ix_orders_priority_created_desc", priority, created_at.desc()),
+        db.Index("ix_orders_department_created_desc", department, created_at.desc()),
+        db.Index(
+            "ix_orders_department_status_created_desc",
+            department,
+            status,
+            created_at.desc(),
+        ),
+    )
+
     def __repr__(self) -> str:  # pragma: no cover - debugging helper
         return f"<Order id={self.id} number={self.order_number}>"
 
-    def to_dict(self) -> dict[str, str | int]:
-        """Return a serializable representation of the order."""
-
-        return {
-            "id": self.id,
-            "order_number": self.order_number,
-            "equipment_type": self.equipment_type,
-            "equipment_id": self.equipment_id,
-            "issue_description": self.issue_description,
-            "priority": self.priority,
-            "status": self.status,
-            "requester_name": self.requester_name,
-            "department": self.department,
-            "contact_phone": self.contact_phone,
-            "contact_email": self.contact_email,
-            "created_at": self._format_dt(self.created_at),
-            "updated_at": self._format_dt(self.updated_at),
-        }
-
-    @staticmethod
-    def _format_dt(value: datetime | None) -> str | None:
-        if value is None:
-            return None
-        # ISO 8601 with UTC "Z" suffix for compatibility.
-        return value.replace(microsecond=0).isoformat() + "Z"
-
-
-__all__: list[str] = ["Order"]
+    @classmethod
+    def bulk_create(cls, rows: Iterable[Mapping[str, Any]]) -> None:
+        """Insert many orders in one executemany and commit.
+
+        Meant for seed and import scripts: rows go through a Core insert, so no
+        ORM instances or unit-of-work bookkeeping are created per row. Each row
+        must carry its own ``order_number``; ``order_counters`` is raised in
+        the same transaction so the API never re-issues an imported number.
+        """
+
+        rows = list(rows)
+        if not rows:
+            return
+        db.session.execute(cls.__table__.insert(), rows)
+
+        highest: dict[int, int] = {}
+        for row in rows:
+            match = _ORDER_NUMBER_PATTERN.match(row["order_number"])
+            if match is None:
+                continue
+            year, sequence = int(match[1]), int(match[2])
+            highest[year] = max(highest.get(year, 0), sequence)
+        for year, sequence in highest.items():
+            OrderCounter.raise_to(year, sequence)
+
+        db.session.commit()
+
+    def to_dict(self) -> dict[str, str | int | datetime]:
+        """Return a serializable representation of the order.
+
+        Timestamps stay ``datetime`` objects; the app's orjson encoder renders
+        them as ISO 8601 UTC strings.
+        """
+
+        # Read loaded column values straight from the instance state instead
+        # of going through the instrumented attribute descriptors.
+        values = self.__dict__
+        if not values.keys() >= _ORDER_DICT_KEY_SET:
+            # Transient, expired or deferred columns are missing from the
+            # state; the descriptors load them or fall back to None.
+            values = {key: getattr(self, key) for key in _ORDER_DICT_KEYS}
+        return {key: values[key] for key in _ORDER_DICT_KEYS}
+
+
+# Statements are constructed once; SQLAlchemy then serves their compiled form
+# from its statement cache instead of re-parsing the SQL on every insert.
+_BUMP_ORDER_COUNTER = text(
+    "UPDATE order_counters SET last_seq = last_seq + 1 "
+    "WHERE year = :year RETURNING last_seq"
+)
+_SEED_ORDER_COUNTER = text(
+    "INSERT INTO order_counters (year, last_seq) VALUES (:year, :seq) "
+    "ON CONFLICT (year) DO UPDATE "
+    "SET last_seq = order_counters.last_seq + 1 RETURNING last_seq"
+)
+# Portable "greatest of" so the upsert runs on both SQLite and PostgreSQL.
+_RAISE_ORDER_COUNTER = text(
+    "INSERT INTO order_counters (year, last_seq) VALUES (:year, :seq) "
+    "ON CONFLICT (year) DO UPDATE SET last_seq = CASE "
+    "WHEN excluded.last_seq > order_counters.last_seq THEN excluded.last_seq "
+    "ELSE order_counters.last_seq END"
+)
+
+
+class OrderCounter(db.Model):
+    """Stores the last issued order sequence number for each calendar year."""
+
+    __tablename__ = "order_counters"
+
+    year = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    last_seq = db.Column(db.Integer, nullable=False, default=0)
+
+    @classmethod
+    def next_seq(cls, year: int, seed: Callable[[], int]) -> int:
+        """Bump the counter for ``year`` and return the new sequence.
+
+        Runs in the caller's transaction. ``seed`` returns the last sequence
+        already in use and is only called when ``year`` has no row yet (first
+        order of the year, or a database that predates the counters table);
+        the upsert keeps this safe if another writer creates the row first.
+        """
+
+        sequence = db.session.execute(_BUMP_ORDER_COUNTER, {"year": year}).scalar()
+        if sequence is None:
+            sequence = db.session.execute(
+                _SEED_ORDER_COUNTER, {"year": year, "seq": seed() + 1}
+            ).scalar_one()
+        return sequence
+
+    @classmethod
+    def raise_to(cls, year: int, last_seq: int) -> None:
+        """Ensure the counter for ``year`` is at least ``last_seq``.
+
+        Runs in the caller's transaction and never lowers a counter that is
+        already further ahead.
+        """
+
+        db.session.execute(_RAISE_ORDER_COUNTER, {"year": year, "seq": last_seq})
+
+    def __repr__(self) -> str:  # pragma: no cover - debugging helper
+        return f"<OrderCounter year={self.year} last_seq={self.last_seq}>"
+
+
+__all__: list[str] = ["Order", "OrderCounter"]
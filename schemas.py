@@ -1,62 +1,41 @@
-"""Pydantic schemas for validating TORO API payloads and query params."""
+"""Pydantic schemas and shared constraints for validating TORO API input."""
 
 from __future__ import annotations
 
-from typing import Annotated, Literal
+from functools import cache
+from typing import Annotated, Literal, get_args
 import re
 
 from pydantic import (
     BaseModel,
     ConfigDict,
-    EmailStr,
-    Field,
+    StringConstraints,
+    TypeAdapter,
     ValidationError,
-    field_validator,
 )
 
 Priority = Literal["low", "medium", "high"]
 Status = Literal["created", "in_progress", "completed"]
-# +7-XXX-XXX-XX-XX pattern includes 11 digits, 4 hyphens and a plus sign.
-# That totals 16 characters, so the field constraints reflect this exact length.
-PhoneStr = Annotated[str, Field(min_length=16, max_length=16)]
-
-PHONE_PATTERN = re.compile(r"^\+7-\d{3}-\d{3}-\d{2}-\d{2}$")
+# Hash-based membership set for the server-side priority check; pydantic
+# fields keep the `Literal` aliases, which pydantic-core validates fastest.
+PRIORITY_CHOICES = frozenset(get_args(Priority))
+# +7-XXX-XXX-XX-XX pattern includes 11 digits, 4 hyphens and a plus sign,
+# 16 characters in total. ASCII mode keeps `\d` from accepting other scripts'
+# digits.
+PHONE_LENGTH = 16
+PHONE_PATTERN = re.compile(r"^\+7-\d{3}-\d{3}-\d{2}-\d{2}$", re.ASCII)
+# Syntactic check only (one "@", a dotted domain, no whitespace); mailbox
+# existence is never verified, matching what the String(255) column stores.
+EMAIL_PATTERN = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
 
 
 class _BaseSchema(BaseModel):
     """Shared configuration for API schemas."""
 
-    model_config = ConfigDict(extra="forbid", str_strip_whitespace=True)
-
-
-class OrderCreateSchema(_BaseSchema):
-    """Schema for validating incoming order creation payloads."""
-
-    equipment_type: Annotated[str, Field(min_length=1, max_length=120)]
-    equipment_id: Annotated[str, Field(min_length=1, max_length=120)]
-    issue_description: Annotated[str, Field(min_length=1)]
-    priority: Priority = "medium"
-    requester_name: Annotated[str, Field(min_length=1, max_length=120)]
-    department: Annotated[str, Field(min_length=1, max_length=120)]
-    contact_phone: PhoneStr
-    contact_email: EmailStr
-
-    @field_validator("issue_description")
-    @classmethod
-    def limit_issue_description(cls, value: str) -> str:
-        if len(value) > 2000:
-            msg = "Issue description must not exceed 2000 characters"
-            raise ValueError(msg)
-        return value
-
-    @field_validator("contact_phone")
-    @classmethod
-    def validate_phone(cls, value: str) -> str:
-        if not value:
-            raise ValueError("Phone is required")
-        if not PHONE_PATTERN.match(value):
-            raise ValueError("Phone must match +7-XXX-XXX-XX-XX")
-        return value
+    # Core schemas are built on first validation instead of at import, which
+    # keeps `import app` (and every worker cold start) light. Whitespace is
+    # stripped per field where it matters rather than for every string.
+    model_config = ConfigDict(extra="forbid", defer_build=True)
 
 
 class OrderFiltersSchema(_BaseSchema):
@@ -64,7 +43,29 @@ class OrderFiltersSchema(_BaseSchema):
 
     priority: Priority | None = None
     status: Status | None = None
-    department: Annotated[str, Field(min_length=1, max_length=120)] | None = None
-
-
-__all__ = ["OrderCreateSchema", "OrderFiltersSchema", "Priority", "Status"]
+    department: (
+        Annotated[
+            str,
+            StringConstraints(strip_whitespace=True, min_length=1, max_length=120),
+        ]
+        | None
+    ) = None
+
+
+@cache
+def get_order_filters_adapter() -> TypeAdapter[OrderFiltersSchema]:
+    """Return the list filter validator, building it on first use only."""
+
+    return TypeAdapter(OrderFiltersSchema)
+
+
+__all__ = [
+    "EMAIL_PATTERN",
+    "OrderFiltersSchema",
+    "PHONE_LENGTH",
+    "PHONE_PATTERN",
+    "PRIORITY_CHOICES",
+    "Priority",
+    "Status",
+    "get_order_filters_adapter",
+]
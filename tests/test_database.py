@@ -0,0 +1,34 @@
+import sys
+from pathlib import Path
+
+from flask import Flask
+from sqlalchemy import text
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from database import _engine_options, db, init_db  # noqa: E402  # pylint: disable=wrong-import-position
+
+
+def test_server_databases_get_a_sized_pool():
+    options = _engine_options("postgresql://toro@localhost/toro")
+
+    assert options["pool_size"] == 20
+    assert options["max_overflow"] == 40
+    assert options["pool_pre_ping"] is True
+
+
+def test_sqlite_connections_use_wal(tmp_path):
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{tmp_path / 'toro.db'}"
+    init_db(app)
+
+    with app.app_context():
+        journal_mode = db.session.execute(text("PRAGMA journal_mode")).scalar()
+        synchronous = db.session.execute(text("PRAGMA synchronous")).scalar()
+        db.session.remove()
+        db.engine.dispose()
+
+    assert journal_mode == "wal"
+    assert synchronous == 1  # NORMAL
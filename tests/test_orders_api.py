@@ -1,37 +1,65 @@
 import os
 import sys
-from copy import deepcopy
 from pathlib import Path
 
 import pytest
+from sqlalchemy.orm import defer, scoped_session, sessionmaker
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
-TEST_DB_PATH = PROJECT_ROOT / "tests" / "test_toro.db"
-TEST_DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-# Use an isolated SQLite database for tests before the app is imported.
-os.environ.setdefault("TORO_DATABASE_URL", f"sqlite:///{TEST_DB_PATH}")
+# Use an isolated in-memory SQLite database for tests before the app is
+# imported; `init_db` shares its single connection through a StaticPool.
+os.environ.setdefault("TORO_DATABASE_URL", "sqlite://")
 
+import app as app_module  # noqa: E402  # pylint: disable=wrong-import-position
 from app import app  # noqa: E402  # pylint: disable=wrong-import-position
 from database import db  # noqa: E402  # pylint: disable=wrong-import-position
-from models import Order  # noqa: E402  # pylint: disable=wrong-import-position
+from models import Order, OrderCounter  # noqa: E402  # pylint: disable=wrong-import-position
 
 app.config.update(TESTING=True)
 
 
-@pytest.fixture(autouse=True)
-def clean_database():
-    """Reset the database before every test to ensure isolation."""
+@pytest.fixture(scope="session", autouse=True)
+def app_context():
+    """Push one app context for the whole run instead of one per use."""
 
     with app.app_context():
-        db.session.remove()
-        db.drop_all()
-        db.create_all()
+        yield
+
+
+@pytest.fixture(scope="session", autouse=True)
+def database_schema(app_context):
+    """Create the schema once; tests roll their changes back instead."""
+
+    db.drop_all()
+    db.create_all()
+
+
+@pytest.fixture(autouse=True)
+def clean_database(database_schema):
+    """Run every test inside an outer transaction that is rolled back."""
+
+    connection = db.engine.connect()
+    # pysqlite defers BEGIN until the first DML statement, so releasing the
+    # session's SAVEPOINT would commit for real. Control BEGIN explicitly.
+    driver_connection = connection.connection.driver_connection
+    driver_connection.isolation_level = None
+    transaction = connection.begin()
+    connection.exec_driver_sql("BEGIN")
+
+    # Session commits only release a SAVEPOINT inside the outer transaction.
+    app_session = db.session
+    db.session = scoped_session(
+        sessionmaker(bind=connection, join_transaction_mode="create_savepoint")
+    )
     yield
-    with app.app_context():
-        db.session.remove()
+    db.session.remove()
+    db.session = app_session
+    transaction.rollback()
+    driver_connection.isolation_level = ""
+    connection.close()
 
 
 @pytest.fixture()
@@ -70,8 +98,7 @@ def test_create_order_success(client, sample_payload):
 
 
 def test_create_order_validation_error(client, sample_payload):
-    invalid_payload = deepcopy(sample_payload)
-    invalid_payload["contact_phone"] = "123"
+    invalid_payload = {**sample_payload, "contact_phone": "123"}
 
     response = client.post("/api/v1/orders", json=invalid_payload)
     data = response.get_json()
@@ -81,18 +108,79 @@ def test_create_order_validation_error(client, sample_payload):
     assert "contact_phone" in data["details"]
 
 
+def test_create_order_rejects_non_ascii_phone_digits(client, sample_payload):
+    invalid_payload = {**sample_payload, "contact_phone": "+7-٩٠٠-123-45-67"}
+
+    response = client.post("/api/v1/orders", json=invalid_payload)
+
+    assert response.status_code == 400
+    assert "contact_phone" in response.get_json()["details"]
+
+
+def test_create_order_rejects_malformed_json(client):
+    response = client.post(
+        "/api/v1/orders", data="{not json", content_type="application/json"
+    )
+
+    assert response.status_code == 400
+    assert response.get_json()["details"] == {"body": "Malformed JSON"}
+
+
+def test_create_order_reports_all_invalid_fields(client, sample_payload):
+    invalid_payload = {
+        **sample_payload,
+        "priority": "urgent",
+        "contact_email": "not-an-email",
+        "unexpected": "value",
+    }
+    del invalid_payload["department"]
+
+    response = client.post("/api/v1/orders", json=invalid_payload)
+    details = response.get_json()["details"]
+
+    assert response.status_code == 400
+    assert set(details) == {"department", "priority", "contact_email", "unexpected"}
+
+
+def test_create_order_strips_whitespace(client, sample_payload):
+    payload = {**sample_payload, "department": "  Цех №1  "}
+    del payload["priority"]
+
+    data = create_order(client, payload).get_json()
+
+    assert data["department"] == "Цех №1"
+    assert data["priority"] == "medium"
+
+
+def test_unhandled_error_returns_json_500(client, sample_payload, monkeypatch):
+    def explode() -> str:
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(app_module, "generate_order_number", explode)
+    monkeypatch.setitem(app.config, "PROPAGATE_EXCEPTIONS", False)
+
+    response = client.post("/api/v1/orders", json=sample_payload)
+
+    assert response.status_code == 500
+    assert response.get_json() == {
+        "error": "internal_server_error",
+        "message": "Unexpected server error",
+    }
+
+
 def test_list_orders_can_be_filtered_by_status(client, sample_payload):
     create_order(client, sample_payload)
 
-    second_payload = deepcopy(sample_payload)
-    second_payload["equipment_id"] = "LAT-050"
-    second_payload["requester_name"] = "Иванов Иван"
+    second_payload = {
+        **sample_payload,
+        "equipment_id": "LAT-050",
+        "requester_name": "Иванов Иван",
+    }
     create_order(client, second_payload)
 
-    with app.app_context():
-        order = Order.query.filter_by(equipment_id="LAT-050").first()
-        order.status = "in_progress"
-        db.session.commit()
+    order = Order.query.filter_by(equipment_id="LAT-050").first()
+    order.status = "in_progress"
+    db.session.commit()
 
     response = client.get("/api/v1/orders", query_string={"status": "in_progress"})
     data = response.get_json()
@@ -102,6 +190,57 @@ def test_list_orders_can_be_filtered_by_status(client, sample_payload):
     assert data["orders"][0]["equipment_id"] == "LAT-050"
 
 
+def test_list_orders_department_filter_ignores_padding(client, sample_payload):
+    create_order(client, sample_payload)
+
+    padded = f"  {sample_payload['department']} "
+    response = client.get("/api/v1/orders", query_string={"department": padded})
+
+    assert response.status_code == 200
+    assert response.get_json()["total"] == 1
+
+
+def test_list_orders_streams_across_batches(client, sample_payload, monkeypatch):
+    monkeypatch.setattr(app_module, "LIST_BATCH_SIZE", 2)
+    created = [create_order(client, sample_payload).get_json()["id"] for _ in range(5)]
+
+    response = client.get("/api/v1/orders")
+    data = response.get_json()
+
+    assert response.status_code == 200
+    assert data["total"] == 5
+    assert sorted(order["id"] for order in data["orders"]) == created
+
+
+def test_bulk_create_inserts_all_rows(client, sample_payload):
+    rows = [
+        {**sample_payload, "order_number": number, "status": "completed"}
+        for number in ("TORO-2020-001", "TORO-2020-002", "TORO-2020-003")
+    ]
+
+    Order.bulk_create(rows)
+
+    response = client.get("/api/v1/orders", query_string={"status": "completed"})
+
+    assert response.get_json()["total"] == 3
+
+
+def test_bulk_create_advances_order_counter(client, sample_payload):
+    first = create_order(client, sample_payload).get_json()["order_number"]
+    prefix = first.rsplit("-", 1)[0]
+
+    Order.bulk_create(
+        {**sample_payload, "order_number": f"{prefix}-{seq:03d}", "status": "created"}
+        for seq in (2, 3)
+    )
+    assert db.session.get(OrderCounter, int(prefix.split("-")[-1])).last_seq == 3
+
+    response = client.post("/api/v1/orders", json=sample_payload)
+
+    assert response.status_code == 201
+    assert response.get_json()["order_number"] == f"{prefix}-004"
+
+
 def test_get_order_returns_404_for_missing_record(client):
     response = client.get("/api/v1/orders/999")
 
@@ -112,9 +251,106 @@ def test_get_order_returns_404_for_missing_record(client):
 def test_order_number_sequence_increments(client, sample_payload):
     first = create_order(client, sample_payload).get_json()["order_number"]
 
-    second_payload = deepcopy(sample_payload)
-    second_payload["equipment_id"] = "LAT-777"
+    second_payload = {**sample_payload, "equipment_id": "LAT-777"}
     second = create_order(client, second_payload).get_json()["order_number"]
 
     assert first != second
     assert int(second.split("-")[-1]) == int(first.split("-")[-1]) + 1
+
+
+def test_list_orders_matches_single_order_representation(client, sample_payload):
+    created = create_order(client, sample_payload).get_json()
+
+    listed = client.get("/api/v1/orders").get_json()["orders"][0]
+    fetched = client.get(f"/api/v1/orders/{created['id']}").get_json()
+
+    assert listed == fetched == created
+    assert created["created_at"].endswith("Z")
+
+
+def test_order_number_sequence_continues_existing_orders(client, sample_payload):
+    first = create_order(client, sample_payload).get_json()
+    prefix = first["order_number"].rsplit("-", 1)[0]
+
+    # Simulate a database created before the counters table existed.
+    db.session.get(Order, first["id"]).order_number = f"{prefix}-041"
+    db.session.query(OrderCounter).delete()
+    db.session.commit()
+
+    second = create_order(client, sample_payload).get_json()["order_number"]
+
+    assert second == f"{prefix}-042"
+
+
+def test_counter_catches_up_with_numbers_written_elsewhere(client, sample_payload):
+    first = create_order(client, sample_payload).get_json()["order_number"]
+    prefix = first.rsplit("-", 1)[0]
+
+    # Occupy numbers ahead of the counter, e.g. after a manual fix-up.
+    for number in (f"{prefix}-002", f"{prefix}-003"):
+        db.session.add(Order(order_number=number, status="created", **sample_payload))
+    db.session.commit()
+
+    for expected in ("004", "005"):
+        response = client.post("/api/v1/orders", json=sample_payload)
+        assert response.status_code == 201
+        assert response.get_json()["order_number"] == f"{prefix}-{expected}"
+
+
+def test_counter_catches_up_past_three_digit_sequences(client, sample_payload):
+    first = create_order(client, sample_payload).get_json()["order_number"]
+    prefix = first.rsplit("-", 1)[0]
+    year = int(prefix.split("-")[-1])
+
+    # 999 sorts above 1005 as a string; the resync must compare numerically.
+    for number in (f"{prefix}-999", f"{prefix}-1005"):
+        db.session.add(Order(order_number=number, status="created", **sample_payload))
+    db.session.get(OrderCounter, year).last_seq = 1003
+    db.session.commit()
+
+    numbers = [
+        client.post("/api/v1/orders", json=sample_payload).get_json()["order_number"]
+        for _ in range(2)
+    ]
+
+    assert numbers == [f"{prefix}-1004", f"{prefix}-1006"]
+
+
+def test_failed_insert_does_not_consume_order_number(
+    client, sample_payload, monkeypatch
+):
+    first = create_order(client, sample_payload).get_json()["order_number"]
+    prefix = first.rsplit("-", 1)[0]
+
+    # Occupy the next number and keep the resync from seeing it, so the
+    # retry fails as well.
+    db.session.add(
+        Order(order_number=f"{prefix}-002", status="created", **sample_payload)
+    )
+    db.session.commit()
+    monkeypatch.setattr(app_module, "_last_issued_sequence", lambda prefix: 0)
+
+    response = client.post("/api/v1/orders", json=sample_payload)
+
+    assert response.status_code == 500
+    assert response.get_json()["message"] == "Unable to create order at this time"
+    assert db.session.get(OrderCounter, int(prefix.split("-")[-1])).last_seq == 1
+
+
+def test_to_dict_handles_transient_and_partially_loaded_orders(
+    client, sample_payload
+):
+    transient = Order(order_number="TORO-2020-001", **sample_payload).to_dict()
+    assert transient["id"] is None
+    assert transient["equipment_id"] == sample_payload["equipment_id"]
+
+    order_id = create_order(client, sample_payload).get_json()["id"]
+    order = db.session.get(Order, order_id)
+    db.session.expire(order, ["status"])
+    assert order.to_dict()["status"] == "created"
+
+    db.session.expunge_all()
+    deferred = Order.query.options(defer(Order.issue_description)).one()
+    assert deferred.to_dict()["issue_description"] == sample_payload[
+        "issue_description"
+    ]